@@ -88,6 +88,12 @@ if SAFE_MODE:
     DELAY_MIN = 0.0
     DELAY_MAX = 0.0
 
+# Fault RNG seed (set for reproducible fault runs, unset = random each session).
+# Re-applied whenever a new sync session starts, so one controller can serve repeated runs.
+RNG_SEED = os.getenv("RNG_SEED")
+if RNG_SEED is not None:
+    random.seed(RNG_SEED)
+
 DELAY_RANGE_S = (min(DELAY_MIN, DELAY_MAX), max(DELAY_MIN, DELAY_MAX))
 SLOWDOWN_ENABLED = BRAKE_RANGE_M < SLOWDOWN_START_M  # if false, only brake/resume will be used
 
@@ -123,6 +129,7 @@ braking_active = False
 last_tx_cmd, last_tx_time = None, 0.0
 last_brake_sent_time = 0.0
 last_recv_time: Optional[float] = None
+last_sim_time: Optional[float] = None  # sim clock from sync-mode telemetry
 no_ped_count = 0
 stale_asserted = False
 
@@ -143,12 +150,34 @@ stats = {
     "stale_enforced": 0,
     "resume_debounced": 0,
     "decisions_none": 0,
+    "sync_acks": 0,
     "total_delay_s": 0.0,
 }
 start_time = time.time()
 
 # - FUNCTIONS -
 
+def controller_now() -> float:
+    """
+    Clock for cooldown / brake-hold timing.
+    Sync-mode telemetry carries sim_time, so timing follows the sim clock (frames, not wall time);
+    between packets it is extrapolated with wall time. Without sim_time this is just time.time().
+    """
+    now = time.time()
+    if last_sim_time is None or last_recv_time is None:
+        return now
+    return last_sim_time + (now - last_recv_time)
+
+def reset_tx_state():
+    """
+    Forget send/brake history. Called when the timing clock changes domain (wall <-> sim)
+    or the sim clock goes backwards (new sync session), since old timestamps are not comparable.
+    """
+    global last_tx_cmd, last_tx_time, braking_active, last_brake_sent_time
+    last_tx_cmd, last_tx_time = None, 0.0
+    last_brake_sent_time = 0.0
+    braking_active = False
+
 def compute_latency(recv_time: float, sent_time) -> float:
     """If sender includes send_time, compute one-way latency estimate."""
     try:
@@ -224,31 +253,43 @@ def apply_faults(cmd: Optional[str], reason: str):
 
     return out_cmd, dropped, delay_used, flipped, out_reason
 
-def map_to_tx_payload(cmd: Optional[str], dist: Optional[float]):
+def map_to_tx_payload(cmd: Optional[str], dist: Optional[float], frame=None):
     """
     Map internal command to the exact JSON expected by the CARLA receiver.
     - brake   -> {"cmd":"brake"}
     - resume  -> {"cmd":"resume"}
     - slowdown-> {"cmd":"slowdown","distance":<float>} only if dist is numeric
+    If the telemetry carried a frame id (sync mode) it is echoed as "frame".
     """
     if cmd == "brake":
-        return {"cmd": "brake"}
-    if cmd == "resume":
-        return {"cmd": "resume"}
-    if cmd == "slowdown":
-        if isinstance(dist, (int, float)):
-            return {"cmd": "slowdown", "distance": round(float(dist), 2)}
+        payload = {"cmd": "brake"}
+    elif cmd == "resume":
+        payload = {"cmd": "resume"}
+    elif cmd == "slowdown" and isinstance(dist, (int, float)):
+        payload = {"cmd": "slowdown", "distance": round(float(dist), 2)}
+    else:
         return None
-    return None
+    if frame is not None:
+        payload["frame"] = frame
+    return payload
+
+def send_sync_ack(frame):
+    """Sync mode: tell the sender this frame was handled with no command, so it can tick."""
+    try:
+        send_sock.sendto(json.dumps({"cmd": "none", "frame": frame}).encode(), (CARLA_IP, CARLA_PORT))
+        stats["sync_acks"] += 1
+    except OSError as se:
+        print(f"[ERROR] ack send failed: {se}")
 
-def maybe_send_payload(payload: Optional[dict], reason_after: str, timestamp: str):
+def maybe_send_payload(payload: Optional[dict], reason_after: str, timestamp: str, now: Optional[float] = None):
     """Send with change-only + cooldown; update state/stats; print based on verbosity."""
     global last_tx_cmd, last_tx_time, braking_active, last_brake_sent_time
     if not payload:
         return False, "no_cmd"
 
     cmd = payload.get("cmd")
-    now = time.time()
+    if now is None:
+        now = controller_now()
 
     # change-only + cooldown
     if cmd == last_tx_cmd and (now - last_tx_time) < COOLDOWN_S:
@@ -382,8 +423,24 @@ with open(CSV_LOG_FILE, "w", newline="") as csvfile, open(JSON_LOG_FILE, "w") as
             distance = data.get("distance", None)
             latency = compute_latency(recv_time, data.get("send_time", None))
 
+            # sync mode: frame id to echo back, sim time drives cooldown/hold timing
+            frame_id = data.get("frame", None)
+            sim_time = data.get("sim_time", None)
+            if not isinstance(frame_id, int):
+                frame_id = None
+            new_sim_time = float(sim_time) if isinstance(sim_time, (int, float)) else None
+            clock_changed = (new_sim_time is None) != (last_sim_time is None)
+            sim_restarted = (new_sim_time is not None and last_sim_time is not None
+                             and new_sim_time < last_sim_time)
+            if clock_changed or sim_restarted:
+                reset_tx_state()
+                if RNG_SEED is not None:
+                    random.seed(RNG_SEED)  # each session gets the same fault stream
+            last_sim_time = new_sim_time
+
             last_recv_time = recv_time
             stale_asserted = False
+            clock_now = last_sim_time if last_sim_time is not None else recv_time
 
             # track consecutive no-ped frames
             no_ped_count = 0 if pedestrian else (no_ped_count + 1)
@@ -399,7 +456,7 @@ with open(CSV_LOG_FILE, "w", newline="") as csvfile, open(JSON_LOG_FILE, "w") as
                 if no_ped_count < NO_PED_FRAMES_NEEDED:
                     gate = True
                     reason = f"debounce resume (no_ped_frames={no_ped_count}<{NO_PED_FRAMES_NEEDED})"
-                if (time.time() - last_brake_sent_time) < MIN_BRAKE_HOLD_S:
+                if (clock_now - last_brake_sent_time) < MIN_BRAKE_HOLD_S:
                     gate = True
                     reason = f"debounce resume (min_hold {MIN_BRAKE_HOLD_S:.2f}s)"
                 if gate:
@@ -413,7 +470,7 @@ with open(CSV_LOG_FILE, "w", newline="") as csvfile, open(JSON_LOG_FILE, "w") as
             if dropped: stats["drops"] += 1
 
             # - build payload + attempt send -
-            payload = map_to_tx_payload(post_cmd, dist_used)
+            payload = map_to_tx_payload(post_cmd, dist_used, frame_id)
             if payload:
                 stats["commands_attempted"] += 1
 
@@ -421,13 +478,18 @@ with open(CSV_LOG_FILE, "w", newline="") as csvfile, open(JSON_LOG_FILE, "w") as
                 dist_str = ("%.1f" % distance) if isinstance(distance, (int, float)) else "None"
                 print(f"[{timestamp}] Speed={speed:.1f} | Pedestrian={pedestrian} | Dist={dist_str}")
 
+            sent = False
             if payload and not dropped:
-                maybe_send_payload(payload, reason_after, timestamp)
+                sent, _ = maybe_send_payload(payload, reason_after, timestamp, clock_now)
             else:
                 if _v_all():
                     why = "dropped" if dropped else reason_after
                     print(f"[{timestamp}] ==> No TX ({why})")
 
+            # sync mode: every frame gets an answer unless the fault injector dropped it
+            if frame_id is not None and not sent and not dropped:
+                send_sync_ack(frame_id)
+
             # - logs -
             fault_parts = []
             if flipped: fault_parts.append("Flip")
@@ -460,6 +522,7 @@ with open(CSV_LOG_FILE, "w", newline="") as csvfile, open(JSON_LOG_FILE, "w") as
 
             jsonfile.write(json.dumps({
                 "timestamp": timestamp,
+                "frame": frame_id,
                 "speed_kmh": round(speed, 2),
                 "pedestrian": pedestrian,
                 "distance_m": (round(float(distance), 2) if isinstance(distance, (int, float)) else None),
@@ -1,12 +1,28 @@
-import carla
+import os
 import socket
+import select
 import json
-import cv2
-import numpy as np
 import time
 
+#run modes
+USE_MOCK = os.getenv("CARLA_MOCK", "0") == "1"      # pure-python carla stand-in, no server needed
+HEADLESS = os.getenv("HEADLESS", "0") == "1"        # no camera / cv2 window
+SYNC_MODE = os.getenv("SYNC_MODE", "0") == "1" or USE_MOCK  # mock world only moves on tick()
+FIXED_DELTA_S = float(os.getenv("FIXED_DELTA_S", "0.05"))   # sim seconds per tick (sync mode)
+SYNC_REPLY_TIMEOUT_S = float(os.getenv("SYNC_REPLY_TIMEOUT_S", "0.2"))  # wait for controller reply per tick
+MAX_FRAMES = int(os.getenv("MAX_FRAMES", "0"))      # 0 = run until stopped
+
+if USE_MOCK:
+    import mock_carla as carla
+else:
+    import carla
+
+if not HEADLESS:
+    import cv2
+    import numpy as np
+
 #udp configs
-UDP_IP = ""  #Ip of Computer 2
+UDP_IP = os.getenv("CTRL_IP", "")  #Ip of Computer 2
 UDP_PORT_SEND = 9000
 UDP_PORT_RECEIVE = 9001
 
@@ -21,30 +37,7 @@ client.set_timeout(5.0)
 world = client.get_world()
 blueprint_lib = world.get_blueprint_library()
 
-#Traffic manager setup
-tm = client.get_trafficmanager()
-tm.set_synchronous_mode(False)  # or True if you're using sync mode
-tm.set_global_distance_to_leading_vehicle(2.5)
-
-#spawning ego vehicle
-vehicle_bp = blueprint_lib.find('vehicle.tesla.model3')
-spawn_point = world.get_map().get_spawn_points()[0]
-vehicle = world.spawn_actor(vehicle_bp, spawn_point)
-vehicle.set_autopilot(True, tm.get_port())
-
-#Traffic Manager code to ignore walkers, traffic light
-tm.ignore_lights_percentage(vehicle, 100.0)
-tm.ignore_walkers_percentage(vehicle, 100.0)
-
-
-#Camera setup for viewing
-camera_bp = blueprint_lib.find('sensor.camera.rgb')
-camera_bp.set_attribute('image_size_x', '640')
-camera_bp.set_attribute('image_size_y', '480')
-camera_bp.set_attribute('fov', '90')
-camera_transform = carla.Transform(carla.Location(x=-6, z=3), carla.Rotation(pitch=-10))
-camera = world.spawn_actor(camera_bp, camera_transform, attach_to=vehicle)
-
+#Camera frames for viewing
 frame = None
 def camera_callback(image):
     global frame
@@ -52,7 +45,57 @@ def camera_callback(image):
     array = np.reshape(array, (image.height, image.width, 4))
     frame = array[:, :, :3]
 
-camera.listen(camera_callback)
+#world restore: a server left in sync mode with nobody ticking hangs every other client
+original_settings = world.get_settings()
+tm = None
+vehicle = None
+camera = None
+def restore_world():
+    if camera is not None:
+        camera.stop()
+        camera.destroy()
+    if vehicle is not None:
+        vehicle.destroy()
+    if SYNC_MODE:
+        if tm is not None:
+            tm.set_synchronous_mode(False)
+        world.apply_settings(original_settings)
+
+try:
+    #Sync mode: world only advances on world.tick(), fixed step per tick
+    if SYNC_MODE:
+        settings = world.get_settings()
+        settings.synchronous_mode = True
+        settings.fixed_delta_seconds = FIXED_DELTA_S
+        world.apply_settings(settings)
+
+    #Traffic manager setup
+    tm = client.get_trafficmanager()
+    tm.set_synchronous_mode(SYNC_MODE)
+    tm.set_global_distance_to_leading_vehicle(2.5)
+
+    #spawning ego vehicle
+    vehicle_bp = blueprint_lib.find('vehicle.tesla.model3')
+    spawn_point = world.get_map().get_spawn_points()[0]
+    vehicle = world.spawn_actor(vehicle_bp, spawn_point)
+    vehicle.set_autopilot(True, tm.get_port())
+
+    #Traffic Manager code to ignore walkers, traffic light
+    tm.ignore_lights_percentage(vehicle, 100.0)
+    tm.ignore_walkers_percentage(vehicle, 100.0)
+
+    #Camera setup for viewing
+    if not HEADLESS:
+        camera_bp = blueprint_lib.find('sensor.camera.rgb')
+        camera_bp.set_attribute('image_size_x', '640')
+        camera_bp.set_attribute('image_size_y', '480')
+        camera_bp.set_attribute('fov', '90')
+        camera_transform = carla.Transform(carla.Location(x=-6, z=3), carla.Rotation(pitch=-10))
+        camera = world.spawn_actor(camera_bp, camera_transform, attach_to=vehicle)
+        camera.listen(camera_callback)
+except BaseException:
+    restore_world()
+    raise
 
 #Pedestrian detection using forward_vector and dot product
 DETECTION_RANGE = 10.0  # meters
@@ -70,9 +113,113 @@ def detect_pedestrian(ego_transform, walkers):
             return True, distance
     return False, None
 
+#Command handling
+#commands are JSON from the controller ({"cmd": "brake", "frame": N}); plain strings still accepted
+braking = False
+first_detect_frame = None
+episode_reacted = False  # first brake of this detection episode already recorded
+cmd_lags = []        # frames between the telemetry a command answers and when it is applied
+sync_acks = 0        # {"cmd": "none"} replies (frame handled, nothing to do)
+reactions = []       # frames from first pedestrian detection to brake applied (includes approach)
+
+def parse_command(msg):
+    text = msg.decode()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return text.strip(), None
+    if not isinstance(data, dict):
+        return str(data), None
+    cmd_frame = data.get("frame")
+    if not isinstance(cmd_frame, int):
+        cmd_frame = None
+    return data.get("cmd"), cmd_frame
+
+def apply_command(cmd, cmd_frame, frame_id):
+    global braking, episode_reacted, sync_acks
+    if cmd == "none":
+        sync_acks += 1
+        return
+    if cmd_frame is not None and frame_id is not None:
+        cmd_lags.append(frame_id - cmd_frame)
+    if cmd == "brake":
+        print(f"[CARLA] Brake message received. (frame={frame_id}, cmd_frame={cmd_frame})")
+        vehicle.set_autopilot(False)
+        vehicle.apply_control(carla.VehicleControl(throttle=0.0, brake=1.0))
+        if not braking and not episode_reacted and first_detect_frame is not None and frame_id is not None:
+            reactions.append(frame_id - first_detect_frame)
+            episode_reacted = True
+        braking = True
+    elif cmd == "resume":
+        print(f"[CARLA] Resume message received. (frame={frame_id}, cmd_frame={cmd_frame})")
+        vehicle.apply_control(carla.VehicleControl(throttle=0.0, brake=0.0))
+        if not SYNC_MODE:
+            time.sleep(0.1)  # in sync mode the next tick does the settling
+        vehicle.set_autopilot(True, tm.get_port())
+        braking = False
+
+def poll_commands(frame_id):
+    """Non-blocking drain of every queued command."""
+    while True:
+        try:
+            msg, _ = recv_sock.recvfrom(1024)
+        except BlockingIOError:
+            return
+        cmd, cmd_frame = parse_command(msg)
+        apply_command(cmd, cmd_frame, frame_id)
+
+def wait_for_reply(frame_id):
+    """Sync mode: block (up to SYNC_REPLY_TIMEOUT_S) until the controller answers this frame."""
+    deadline = time.time() + SYNC_REPLY_TIMEOUT_S
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        ready, _, _ = select.select([recv_sock], [], [], remaining)
+        if not ready:
+            return False
+        try:
+            msg, _ = recv_sock.recvfrom(1024)
+        except BlockingIOError:
+            continue
+        cmd, cmd_frame = parse_command(msg)
+        apply_command(cmd, cmd_frame, frame_id)
+        if cmd_frame is not None and cmd_frame >= frame_id:
+            return True
+
+def print_summary(frames, wall_s):
+    print("\n=== CARLA SUMMARY ===")
+    print(f"frames: {frames} | wall: {wall_s:.2f}s", end="")
+    if SYNC_MODE:
+        sim_s = frames * FIXED_DELTA_S
+        print(f" | sim: {sim_s:.2f}s | speedup: {sim_s / wall_s if wall_s > 0 else 0.0:.1f}x")
+    else:
+        print()
+    # command lag is the controller/network latency figure; detect->brake also counts the
+    # approach from DETECTION_RANGE to the controller's brake range, so it is mostly geometry
+    if cmd_lags:
+        avg = sum(cmd_lags) / len(cmd_lags)
+        ms = f" ({avg * FIXED_DELTA_S * 1000:.0f} ms avg)" if SYNC_MODE else ""
+        print(f"command lag (frames): avg={avg:.2f} max={max(cmd_lags)} n={len(cmd_lags)}{ms}")
+    if sync_acks:
+        print(f"sync acks (no command): {sync_acks}")
+    for r in reactions:
+        ms = f" = {r * FIXED_DELTA_S * 1000:.0f} ms" if SYNC_MODE else ""
+        print(f"detect -> brake (incl. approach): {r} frames{ms}")
+
 #Main loop
+frames_run = 0
+missed_replies = 0
+wall_start = time.time()
 try:
     while True:
+        if SYNC_MODE:
+            frame_id = world.tick()
+            sim_time = world.get_snapshot().timestamp.elapsed_seconds
+        else:
+            frame_id, sim_time = None, None
+        frames_run += 1
+
         if frame is not None:
             cv2.imshow("Third-Person Camera", frame)
             if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -86,6 +233,11 @@ try:
         ego_transform = vehicle.get_transform()
         walkers = world.get_actors().filter('walker.pedestrian.*')
         detected, distance = detect_pedestrian(ego_transform, walkers)
+        if not detected:
+            first_detect_frame = None  # pedestrian left range, episode over
+            episode_reacted = False
+        elif first_detect_frame is None:
+            first_detect_frame = frame_id
 
         #sending data using udp
         data = {
@@ -93,25 +245,27 @@ try:
             "pedestrian_detected": detected,
             "distance": round(distance, 2) if distance else None
         }
+        if SYNC_MODE:
+            data["frame"] = frame_id
+            data["sim_time"] = round(sim_time, 3)
         send_sock.sendto(json.dumps(data).encode(), (UDP_IP, UDP_PORT_SEND))
 
         #listen for brake or resume commands
-        try:
-            msg, _ = recv_sock.recvfrom(1024)
-            cmd = msg.decode()
-            if cmd == "brake":
-                print("[CARLA] Brake message received.")
-                vehicle.set_autopilot(False)
-                vehicle.apply_control(carla.VehicleControl(throttle=0.0, brake=1.0))
-            elif cmd == "resume":
-                print("[CARLA] Resume message received.")
-                vehicle.apply_control(carla.VehicleControl(throttle=0.0, brake=0.0))
-                time.sleep(0.1)
-                vehicle.set_autopilot(True, tm.get_port())
-        except BlockingIOError:
-            pass
+        if SYNC_MODE:
+            if not wait_for_reply(frame_id):
+                missed_replies += 1
+        else:
+            poll_commands(frame_id)
+
+        if MAX_FRAMES and frames_run >= MAX_FRAMES:
+            break
 
+except KeyboardInterrupt:
+    pass
 finally:
-    camera.stop()
-    vehicle.destroy()
-    cv2.destroyAllWindows()
+    print_summary(frames_run, time.time() - wall_start)
+    if SYNC_MODE:
+        print(f"missed replies: {missed_replies}")
+    restore_world()
+    if not HEADLESS:
+        cv2.destroyAllWindows()
@@ -0,0 +1,336 @@
+# mock_carla.py
+# pure-python stand-in for the parts of the `carla` API used by carla-detection.py
+# the world only moves when world.tick() is called, so runs are deterministic
+# and go as fast as the cpu allows (no CARLA server needed)
+
+import fnmatch
+import math
+
+# - geometry -
+
+class Vector3D:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __add__(self, other):
+        return type(self)(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other):
+        return type(self)(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, k):
+        return type(self)(self.x * k, self.y * k, self.z * k)
+
+    __rmul__ = __mul__
+
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def make_unit_vector(self):
+        n = self.length()
+        if n == 0.0:
+            return Vector3D(0.0, 0.0, 0.0)
+        return Vector3D(self.x / n, self.y / n, self.z / n)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(x={self.x:.3f}, y={self.y:.3f}, z={self.z:.3f})"
+
+class Location(Vector3D):
+    pass
+
+class Rotation:
+    def __init__(self, pitch=0.0, yaw=0.0, roll=0.0):
+        self.pitch = float(pitch)
+        self.yaw = float(yaw)
+        self.roll = float(roll)
+
+    def get_forward_vector(self):
+        cp, sp = math.cos(math.radians(self.pitch)), math.sin(math.radians(self.pitch))
+        cy, sy = math.cos(math.radians(self.yaw)), math.sin(math.radians(self.yaw))
+        return Vector3D(cp * cy, cp * sy, sp)
+
+class Transform:
+    def __init__(self, location=None, rotation=None):
+        self.location = location if location is not None else Location()
+        self.rotation = rotation if rotation is not None else Rotation()
+
+    def get_forward_vector(self):
+        return self.rotation.get_forward_vector()
+
+class VehicleControl:
+    def __init__(self, throttle=0.0, brake=0.0):
+        self.throttle = float(throttle)
+        self.brake = float(brake)
+
+class WalkerControl:
+    def __init__(self, direction=None, speed=0.0):
+        self.direction = direction if direction is not None else Vector3D()
+        self.speed = float(speed)
+
+# - settings / snapshots -
+
+class WorldSettings:
+    def __init__(self, synchronous_mode=False, fixed_delta_seconds=None):
+        self.synchronous_mode = synchronous_mode
+        self.fixed_delta_seconds = fixed_delta_seconds
+
+class Timestamp:
+    def __init__(self, elapsed_seconds):
+        self.elapsed_seconds = elapsed_seconds
+
+class WorldSnapshot:
+    def __init__(self, frame, elapsed_seconds):
+        self.frame = frame
+        self.timestamp = Timestamp(elapsed_seconds)
+
+class Image:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.raw_data = bytes(width * height * 4)  # BGRA, all black
+
+# - blueprints -
+
+class ActorBlueprint:
+    def __init__(self, type_id):
+        self.id = type_id
+        self._attrs = {}
+
+    def set_attribute(self, key, value):
+        self._attrs[key] = str(value)
+
+class BlueprintLibrary:
+    IDS = (
+        "vehicle.tesla.model3",
+        "walker.pedestrian.0001",
+        "sensor.camera.rgb",
+    )
+
+    def find(self, type_id):
+        if type_id not in self.IDS:
+            raise IndexError(f"blueprint '{type_id}' not found")
+        return ActorBlueprint(type_id)
+
+# - actors -
+
+class Actor:
+    def __init__(self, world, actor_id, type_id, transform, parent=None):
+        self._world = world
+        self.id = actor_id
+        self.type_id = type_id
+        self.parent = parent
+        self.is_alive = True
+        self._transform = Transform(
+            Location(transform.location.x, transform.location.y, transform.location.z),
+            Rotation(transform.rotation.pitch, transform.rotation.yaw, transform.rotation.roll),
+        )
+        self._velocity = Vector3D()
+
+    def get_transform(self):
+        if self.parent is None:
+            return self._transform
+        # attached actors follow the parent's position (rotation offset kept as-is)
+        p = self.parent.get_transform()
+        return Transform(p.location + self._transform.location, self._transform.rotation)
+
+    def get_location(self):
+        return self.get_transform().location
+
+    def get_velocity(self):
+        return self._velocity
+
+    def destroy(self):
+        if not self.is_alive:
+            return False
+        self.is_alive = False
+        self._world._actors.pop(self.id, None)
+        return True
+
+    def _step(self, dt):
+        pass
+
+class Vehicle(Actor):
+    # simple longitudinal model, the vehicle drives along its own yaw
+    AUTOPILOT_SPEED_MS = 30.0 / 3.6
+    MAX_ACCEL_MS2 = 3.0
+    MAX_DECEL_MS2 = 8.0
+    COAST_DECEL_MS2 = 0.3
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.autopilot = False
+        self.control = VehicleControl()
+        self._speed = 0.0
+
+    def set_autopilot(self, enabled=True, tm_port=8000):
+        self.autopilot = bool(enabled)
+
+    def apply_control(self, control):
+        self.control = control
+
+    def _step(self, dt):
+        if self.autopilot:
+            err = self.AUTOPILOT_SPEED_MS - self._speed
+            accel = max(-self.MAX_DECEL_MS2, min(self.MAX_ACCEL_MS2, err / dt))
+        else:
+            c = self.control
+            accel = c.throttle * self.MAX_ACCEL_MS2 - c.brake * self.MAX_DECEL_MS2
+            if c.throttle == 0.0 and c.brake == 0.0:
+                accel = -self.COAST_DECEL_MS2
+        self._speed = max(0.0, self._speed + accel * dt)
+
+        fwd = self._transform.get_forward_vector()
+        self._velocity = fwd * self._speed
+        self._transform.location = self._transform.location + self._velocity * dt
+
+class Walker(Actor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.control = WalkerControl()
+
+    def apply_control(self, control):
+        self.control = control
+        self._velocity = control.direction.make_unit_vector() * control.speed
+
+    def _step(self, dt):
+        self._transform.location = self._transform.location + self._velocity * dt
+
+class Sensor(Actor):
+    def __init__(self, *args, blueprint=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._callback = None
+        attrs = blueprint._attrs if blueprint is not None else {}
+        self._width = int(attrs.get("image_size_x", 800))
+        self._height = int(attrs.get("image_size_y", 600))
+
+    def listen(self, callback):
+        self._callback = callback
+
+    def stop(self):
+        self._callback = None
+
+    def _emit(self):
+        if self._callback is not None:
+            self._callback(Image(self._width, self._height))
+
+class ActorList(list):
+    def filter(self, pattern):
+        return ActorList(a for a in self if fnmatch.fnmatch(a.type_id, pattern))
+
+# - map / world -
+
+class Map:
+    def get_spawn_points(self):
+        # straight road along +x, spaced 50 m apart
+        return [Transform(Location(x=50.0 * i, y=0.0, z=0.5), Rotation(yaw=0.0)) for i in range(4)]
+
+def default_scenario(world):
+    """One pedestrian crossing the road 40 m ahead of spawn point 0."""
+    bp = world.get_blueprint_library().find("walker.pedestrian.0001")
+    walker = world.spawn_actor(bp, Transform(Location(x=40.0, y=-4.0, z=1.0)))
+    walker.apply_control(WalkerControl(direction=Vector3D(0.0, 1.0, 0.0), speed=0.7))
+
+class World:
+    def __init__(self, scenario=default_scenario):
+        self._actors = {}
+        self._next_id = 1
+        self._settings = WorldSettings()
+        self._map = Map()
+        self._blueprints = BlueprintLibrary()
+        self.frame = 0
+        self.elapsed_seconds = 0.0
+        if scenario is not None:
+            scenario(self)
+
+    def get_blueprint_library(self):
+        return self._blueprints
+
+    def get_map(self):
+        return self._map
+
+    def get_settings(self):
+        s = self._settings
+        return WorldSettings(s.synchronous_mode, s.fixed_delta_seconds)
+
+    def apply_settings(self, settings):
+        self._settings = WorldSettings(settings.synchronous_mode, settings.fixed_delta_seconds)
+        return self.frame
+
+    def spawn_actor(self, blueprint, transform, attach_to=None):
+        cls = Actor
+        kwargs = {}
+        if blueprint.id.startswith("vehicle."):
+            cls = Vehicle
+        elif blueprint.id.startswith("walker."):
+            cls = Walker
+        elif blueprint.id.startswith("sensor."):
+            cls = Sensor
+            kwargs["blueprint"] = blueprint
+        actor = cls(self, self._next_id, blueprint.id, transform, parent=attach_to, **kwargs)
+        self._actors[actor.id] = actor
+        self._next_id += 1
+        return actor
+
+    def get_actors(self):
+        return ActorList(self._actors.values())
+
+    def get_snapshot(self):
+        return WorldSnapshot(self.frame, self.elapsed_seconds)
+
+    def _delta(self):
+        return self._settings.fixed_delta_seconds or 0.05
+
+    def tick(self, seconds=10.0):
+        """Advance the simulation one fixed step; returns the new frame id."""
+        dt = self._delta()
+        for a in list(self._actors.values()):
+            a._step(dt)
+        self.frame += 1
+        self.elapsed_seconds += dt
+        for a in list(self._actors.values()):
+            if isinstance(a, Sensor):
+                a._emit()
+        return self.frame
+
+# - client / traffic manager -
+
+class TrafficManager:
+    def __init__(self, port=8000):
+        self._port = port
+        self.synchronous_mode = False
+
+    def get_port(self):
+        return self._port
+
+    def set_synchronous_mode(self, mode=True):
+        self.synchronous_mode = bool(mode)
+
+    def set_global_distance_to_leading_vehicle(self, distance):
+        pass
+
+    def ignore_lights_percentage(self, actor, perc):
+        pass
+
+    def ignore_walkers_percentage(self, actor, perc):
+        pass
+
+class Client:
+    def __init__(self, host="localhost", port=2000):
+        self.host = host
+        self.port = port
+        self._timeout = 5.0
+        self._world = World()
+        self._tm = {}
+
+    def set_timeout(self, seconds):
+        self._timeout = float(seconds)
+
+    def get_world(self):
+        return self._world
+
+    def get_trafficmanager(self, client_connection=8000):
+        if client_connection not in self._tm:
+            self._tm[client_connection] = TrafficManager(client_connection)
+        return self._tm[client_connection]